@@ -1,11 +1,28 @@
 import streamlit as st
 import requests
-import json
-import openai
-import time
-import tempfile
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import logging
 import os
-import zipfile
+import re
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+
+# Debug output (request/response payloads) is only built when enabled,
+# e.g. with LANGVERSE_LOG_LEVEL=DEBUG. Only the app's own logger is affected.
+log = logging.getLogger("langverse")
+if not log.handlers:
+    # Streamlit reruns this script, so only attach the handler once
+    log.addHandler(logging.StreamHandler())
+    log.propagate = False
+log_level = os.environ.get("LANGVERSE_LOG_LEVEL", "WARNING").upper()
+try:
+    log.setLevel(log_level)
+except ValueError:
+    log.setLevel(logging.WARNING)
+    log.warning("Unknown LANGVERSE_LOG_LEVEL %r, using WARNING", log_level)
 
 # Hide the default menu
 st.set_page_config(
@@ -26,8 +43,14 @@ if 'locales' not in st.session_state:
     st.session_state.locales = []
 if 'current_content' not in st.session_state:
     st.session_state.current_content = None
-if 'parsed_nodes' not in st.session_state:
-    st.session_state.parsed_nodes = None
+if 'parsed_content' not in st.session_state:
+    st.session_state.parsed_content = None
+if 'text_translation_cache' not in st.session_state:
+    st.session_state.text_translation_cache = {}
+if 'translations' not in st.session_state:
+    st.session_state.translations = {}
+if 'openai_resume_at' not in st.session_state:
+    st.session_state.openai_resume_at = 0.0
 
 # Add sidebar configuration
 with st.sidebar:
@@ -57,38 +80,135 @@ with st.sidebar:
     if openai_key:
         st.session_state.openai_key = openai_key
 
-def get_pages(site_id, api_key):
-    """Get list of pages with their IDs"""
-    url = f"https://api.webflow.com/v2/sites/{site_id}/pages"
-    headers = {
+# How long fetched page content is cached, in seconds. Site locales and pages are
+# not cached: fetching them is what validates the API token and its scopes.
+WEBFLOW_CACHE_TTL = 300
+
+# Maximum number of languages translated and uploaded at the same time
+MAX_CONCURRENT_TRANSLATIONS = 4
+
+# Maximum number of OpenAI requests in flight, across all languages
+MAX_CONCURRENT_OPENAI_REQUESTS = 8
+
+# Number of texts sent to OpenAI in a single translation request
+TRANSLATION_CHUNK_SIZE = 20
+
+# Minimum time between progress bar updates during a translate run, in seconds
+PROGRESS_UPDATE_INTERVAL = 0.2
+
+# Hold back further OpenAI requests until the request limit resets once fewer than this remain
+RATE_LIMIT_REMAINING_THRESHOLD = 2
+# Upper bound for a single rate limit pause, in seconds
+RATE_LIMIT_MAX_WAIT = 30
+
+# Template for the curl command that updates a single property override
+CURL_COMMAND_TEMPLATE = """curl -X POST "https://api.webflow.com/v2/pages/{page_id}/dom?localeId={locale_id}" \\
+     -H "Authorization: Bearer {api_key}" \\
+     -H "Content-Type: application/json" \\
+     -d '{{
+  "nodes": [
+    {{
+      "nodeId": "{node_id}",
+      "propertyOverrides": [
+        {{
+          "propertyId": "{property_id}",
+          "text": "{text}"
+        }}
+      ]
+    }}
+  ]
+}}'"""
+
+# Structured output schema for translation responses, so OpenAI always returns valid JSON
+TRANSLATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "translations",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "translations": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                }
+            },
+            "required": ["translations"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Rate limit reset durations look like "1s", "120ms" or "6m0s"
+RESET_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+RESET_DURATION_UNITS = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+
+# Shared HTTP session so Webflow requests reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # raise_on_status=False hands the last response back once retries run out,
+    # so raise_for_status() still reports it as an HTTPError with its status code
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        raise_on_status=False
+    )
+))
+
+def auth_headers(api_key):
+    """Return the headers every Webflow API request needs"""
+    return {
         "accept": "application/json",
         "authorization": f"Bearer {api_key}"
     }
+
+def mask_headers(headers):
+    """Return a copy of request headers that is safe to log"""
+    return {
+        key: f"Bearer ****{value[-4:]}" if key.lower() == 'authorization' else value
+        for key, value in headers.items()
+    }
+
+def get_pages(site_id, api_key):
+    """Get list of pages with their IDs
+    
+    Returns (pages, error_code, error_message). On failure pages is None and
+    error_code is the HTTP status, or None when the request could not be made at all.
+    """
+    url = f"https://api.webflow.com/v2/sites/{site_id}/pages"
+    headers = auth_headers(api_key)
     
-    print(f"\n[DEBUG] Fetching pages from URL: {url}")
+    log.debug("Fetching pages from URL: %s", url)
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url, headers=headers)
         response.raise_for_status()
-        pages = response.json()["pages"]
-        print(f"[DEBUG] Successfully fetched {len(pages)} pages")
-        return pages
+        pages = orjson.loads(response.content)["pages"]
+        log.debug("Successfully fetched %d pages", len(pages))
+        return pages, None, None
+    except requests.exceptions.HTTPError as e:
+        log.error("Error fetching pages: %s", e)
+        return None, e.response.status_code, str(e)
     except Exception as e:
-        print(f"[DEBUG] Error fetching pages: {str(e)}")
-        st.error(f"Error fetching pages: {str(e)}")
-        return []
+        log.error("Error fetching pages: %s", e)
+        return None, None, str(e)
 
 def get_site_locales(site_id, api_key):
-    """Get list of locales with their IDs"""
+    """Get list of locales with their IDs
+    
+    Also serves as API token validation. Returns (locales, error_code, error_message).
+    On failure locales is None and error_code is the HTTP status, or None when the
+    request could not be made at all.
+    """
     url = f"https://api.webflow.com/v2/sites/{site_id}"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}"
-    }
+    headers = auth_headers(api_key)
     
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url, headers=headers)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         locales = []
         # Add primary locale
@@ -103,272 +223,382 @@ def get_site_locales(site_id, api_key):
             locale['type'] = 'Secondary'
             locales.append(locale)
             
-        return locales
+        return locales, None, None
+    except requests.exceptions.HTTPError as e:
+        log.error("Error fetching site locales: %s", e)
+        return None, e.response.status_code, str(e)
     except Exception as e:
-        print(f"\nERROR: {str(e)}")
-        st.error(f"Error fetching site locales: {str(e)}")
-        return []
+        log.error("Error fetching site locales: %s", e)
+        return None, None, str(e)
+
+def show_api_error(error_code, error_message):
+    """Show a Webflow API error, explaining token and permission problems"""
+    if error_code == 401:
+        st.error("Invalid API token. Please check your token and ensure it has the required permissions (pages:read)")
+    elif error_code == 403:
+        st.error("API token doesn't have the required permissions. Please ensure it has 'pages:read' scope")
+    elif error_code:
+        st.error(f"API Error: {error_message}")
+    else:
+        st.error(f"Connection Error: {error_message}")
 
+@st.cache_data(ttl=WEBFLOW_CACHE_TTL, show_spinner=False)
 def get_page_content(page_id, api_key):
     """Get page content using DOM endpoint"""
     url = f"https://api.webflow.com/v2/pages/{page_id}/dom"
     headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}",
+        **auth_headers(api_key),
         "accept-version": "1.0.0"
     }
     
-    print("\n" + "="*50)
-    print("API REQUEST - Get Page Content")
-    print("="*50)
-    print(f"URL: {url}")
-    print("\nHeaders:")
-    for key, value in headers.items():
-        if key.lower() == 'authorization':
-            print(f"{key}: Bearer ****{value[-4:]}")
-        else:
-            print(f"{key}: {value}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("API REQUEST - Get Page Content\nURL: %s\nHeaders: %s", url, mask_headers(headers))
     
     try:
-        response = requests.get(url, headers=headers)
+        response = SESSION.get(url, headers=headers)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
-        # Print the complete API response
-        print("\n" + "="*50)
-        print("COMPLETE API RESPONSE")
-        print("="*50)
-        print(json.dumps(data, indent=2))
+        # Log the complete API response
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("COMPLETE API RESPONSE\n%s", orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
         
         return data
     except Exception as e:
-        print(f"\nERROR: {str(e)}")
+        log.error("Error fetching page content: %s", e)
         st.error(f"Error fetching page content: {str(e)}")
         return None
 
-def validate_api_token(api_key):
-    """Validate API token by making a test request"""
-    url = "https://api.webflow.com/v2/sites"
-    headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}"
-    }
-    
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return True
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            st.error("Invalid API token. Please check your token and ensure it has the required permissions (pages:read)")
-        elif e.response.status_code == 403:
-            st.error("API token doesn't have the required permissions. Please ensure it has 'pages:read' scope")
-        else:
-            st.error(f"API Error: {str(e)}")
-        return False
-    except Exception as e:
-        st.error(f"Connection Error: {str(e)}")
-        return False
-
 def parse_page_content(content):
-    """Parse page content and extract nodes with property overrides"""
-    parsed_nodes = []
+    """Parse page content into parallel lists of property override IDs and texts
+    
+    Returns {"ids": [(nodeId, propertyId), ...], "texts": [text, ...]}, so only the
+    texts need to be sent for translation.
+    """
+    ids = []
+    texts = []
     
     for node in content.get('nodes', []):
-        # Only process nodes that have propertyOverrides
-        if node.get('propertyOverrides'):
-            node_data = {
-                "nodeId": node['id'],
-                "propertyOverrides": []
-            }
-            
-            # Extract property overrides that have text content
-            for override in node['propertyOverrides']:
-                if 'propertyId' in override and 'text' in override:
-                    property_data = {
-                        "propertyId": override['propertyId'],
-                        "text": override['text'].get('text', '')  # Get the text value
-                    }
-                    node_data["propertyOverrides"].append(property_data)
-            
-            if node_data["propertyOverrides"]:  # Only add if there are property overrides
-                parsed_nodes.append(node_data)
+        # Extract property overrides that have text content
+        for override in node.get('propertyOverrides') or []:
+            if 'propertyId' in override and 'text' in override:
+                ids.append((node['id'], override['propertyId']))
+                texts.append(override['text'].get('text', ''))  # Get the text value
     
-    return parsed_nodes
+    return {"ids": ids, "texts": texts}
 
-def display_curl_commands(page_id, locale_id, api_key, nodes):
-    """Display curl commands for each node"""
+def build_nodes(ids, texts):
+    """Rebuild the DOM endpoint's node structure from parallel ID and text lists"""
+    overrides_by_node = {}
+    for (node_id, property_id), text in zip(ids, texts):
+        overrides_by_node.setdefault(node_id, []).append({
+            "propertyId": property_id,
+            "text": text
+        })
+    
+    return [
+        {"nodeId": node_id, "propertyOverrides": overrides}
+        for node_id, overrides in overrides_by_node.items()
+    ]
+
+def display_curl_commands(page_id, locale_id, api_key, parsed_content):
+    """Display curl commands for each property override"""
     st.subheader("Generated CURL Commands")
     
-    for node in nodes:
-        for prop in node["propertyOverrides"]:
-            curl_command = f"""curl -X POST "https://api.webflow.com/v2/pages/{page_id}/dom?localeId={locale_id}" \\
-     -H "Authorization: Bearer {api_key}" \\
-     -H "Content-Type: application/json" \\
-     -d '{{
-  "nodes": [
-    {{
-      "nodeId": "{node['nodeId']}",
-      "propertyOverrides": [
-        {{
-          "propertyId": "{prop['propertyId']}",
-          "text": "{prop['text']}"
-        }}
-      ]
-    }}
-  ]
-}}'"""
-            st.code(curl_command, language="bash")
-            st.markdown("---")
+    # Render every command in one code block instead of one element per override
+    request_fields = {"page_id": page_id, "locale_id": locale_id, "api_key": api_key}
+    curl_commands = "\n\n".join(
+        CURL_COMMAND_TEMPLATE.format_map({
+            **request_fields,
+            "node_id": node_id,
+            "property_id": property_id,
+            "text": text
+        })
+        for (node_id, property_id), text in zip(parsed_content["ids"], parsed_content["texts"])
+    )
+    st.code(curl_commands, language="bash")
+
+def rate_limit_reset_delay(headers):
+    """Return the seconds until the OpenAI request limit resets, from a response's headers"""
+    reset = headers.get("x-ratelimit-reset-requests", "")
+    delay = sum(
+        float(amount) * RESET_DURATION_UNITS[unit]
+        for amount, unit in RESET_DURATION_PATTERN.findall(reset)
+    )
+    return min(delay, RATE_LIMIT_MAX_WAIT)
+
+def rate_limit_delay(headers):
+    """Return how long to hold back further OpenAI requests, based on a response's rate limit headers
+    
+    Returns 0 unless the remaining request budget is nearly exhausted.
+    """
+    remaining = headers.get("x-ratelimit-remaining-requests")
+    if remaining is None or int(remaining) >= RATE_LIMIT_REMAINING_THRESHOLD:
+        return 0
+    return rate_limit_reset_delay(headers)
+
+def pause_openai_requests(delay):
+    """Hold back every OpenAI request in this session for `delay` seconds"""
+    if delay:
+        log.debug("OpenAI rate limit nearly reached, pausing requests for %.2fs", delay)
+        st.session_state.openai_resume_at = max(
+            st.session_state.openai_resume_at, time.monotonic() + delay
+        )
+
+async def wait_for_openai_resume():
+    """Sleep until no OpenAI request pause is active, including pauses set while sleeping"""
+    while (delay := st.session_state.openai_resume_at - time.monotonic()) > 0:
+        await asyncio.sleep(delay)
+
+async def translate_texts(client, semaphore, texts, target_language):
+    """Translate a list of strings with a single OpenAI request
+    
+    Returns (translated_texts, error), with translations in the same order as `texts`.
+    """
+    # Imported here so reruns that never translate don't pay for loading them
+    import openai
+    from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+    
+    # Send only the texts, without the node and property IDs
+    user_message = orjson.dumps(texts).decode()
+    log.debug(
+        "TRANSLATION REQUEST\nTarget Language: %s\nTexts to translate (%d): %s",
+        target_language, len(texts), user_message
+    )
+    
+    # Prepare the system message explaining what we want
+    system_message = f"""You are a professional translator with 20 years of experience.  
+    Translate each element of the JSON array to {target_language}. 
+    Follow these rules when translating:
+
+    - When encountering the word "Deriv" and any succeeding word, analyze the context and based on it, keep it in English. For example, "Deriv Blog," "Deriv Life," "Deriv Bot," and "Deriv App" should be kept in English.
+    - Keep product names such as P2P, MT5, Deriv X, Deriv cTrader, SmartTrader, Deriv Trader, Deriv GO, Deriv Bot, and Binary Bot in English.
+    
+    Return one translation for each element, in the same order."""
+    
+    # Make the API call, backing off exponentially when rate limited or on transient failures
+    try:
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception_type((
+                openai.RateLimitError,
+                openai.APIConnectionError,
+                openai.InternalServerError
+            )),
+            wait=wait_exponential(multiplier=0.5, max=30),
+            stop=stop_after_attempt(5),
+            reraise=True
+        ):
+            with attempt:
+                while True:
+                    # Wait out a request limit pause without holding a slot
+                    await wait_for_openai_resume()
+                    async with semaphore:
+                        # Another response may have paused requests while this one
+                        # waited for a slot; if so give the slot back and wait again
+                        if st.session_state.openai_resume_at > time.monotonic():
+                            continue
+                        
+                        try:
+                            raw_response = await client.chat.completions.with_raw_response.create(
+                                model="gpt-4o-mini",
+                                messages=[
+                                    {"role": "system", "content": system_message},
+                                    {"role": "user", "content": user_message}
+                                ],
+                                temperature=0.3,
+                                response_format=TRANSLATION_RESPONSE_FORMAT
+                            )
+                        except openai.RateLimitError as e:
+                            # The budget is exhausted, so hold back the other requests too
+                            pause_openai_requests(rate_limit_reset_delay(e.response.headers))
+                            raise
+                        response = raw_response.parse()
+                        break
+                
+                # When the request budget is nearly used up, hold back every later
+                # request until it resets; this response itself is already complete
+                pause_openai_requests(rate_limit_delay(raw_response.headers))
+        
+        # Log the raw response for debugging
+        log.debug("OpenAI Response: %s", response)
+        
+        # Extract and validate the response content
+        choice = response.choices[0]
+        if choice.message.refusal:
+            return None, f"OpenAI refused to translate: {choice.message.refusal}"
+        if choice.finish_reason == "length":
+            return None, "OpenAI response was cut off before the translation finished"
+        if not choice.message.content:
+            return None, "Empty response from OpenAI"
+        
+        # The response follows TRANSLATION_RESPONSE_FORMAT, so it is always valid JSON
+        response_content = choice.message.content
+        translated_texts = orjson.loads(response_content)["translations"]
+        if len(translated_texts) != len(texts):
+            log.error("Unexpected translation count\nRaw response content:\n%s", response_content)
+            return None, f"Expected a JSON array of {len(texts)} translations from OpenAI"
+        
+        return translated_texts, None
+            
+    except Exception as e:
+        log.error("OpenAI API Error: %s", e)
+        return None, f"OpenAI API Error: {str(e)}"
 
-def translate_content_with_openai(parsed_nodes, target_language, api_key):
-    """Translate content using OpenAI while preserving JSON structure"""
+async def translate_content_with_openai(client, semaphore, texts, target_language):
+    """Translate a page's texts using OpenAI
+    
+    Returns (translated_texts, error), with translations in the same order as `texts`.
+    """
     try:
         # First verify we have valid inputs
-        if not parsed_nodes:
+        if not texts:
             return None, "No content to translate"
         if not target_language:
             return None, "No target language specified"
-        if not api_key:
-            return None, "OpenAI API key is missing"
-            
-        client = openai.OpenAI(api_key=api_key)
         
-        # Print debug information
-        print("\n" + "="*50)
-        print("TRANSLATION REQUEST")
-        print("="*50)
-        print(f"Target Language: {target_language}")
-        print("Content to translate:")
-        print(json.dumps(parsed_nodes, indent=2))
-        
-        # Prepare the system message explaining what we want
-        system_message = f"""You are a professional translator with 20 years of experience.  
-        Translate only the "text" values in the JSON to {target_language}. 
-        Follow these rules when translating:
-
-        - When encountering the word "Deriv" and any succeeding word, analyze the context and based on it, keep it in English. For example, "Deriv Blog," "Deriv Life," "Deriv Bot," and "Deriv App" should be kept in English.
-        - Keep product names such as P2P, MT5, Deriv X, Deriv cTrader, SmartTrader, Deriv Trader, Deriv GO, Deriv Bot, and Binary Bot in English.
+        # Only send strings that have not been translated to this language before,
+        # so recurring elements (navigation, footer) are translated once across pages
+        text_cache = st.session_state.text_translation_cache
+        missing_texts = list(dict.fromkeys(
+            text for text in texts if (text, target_language) not in text_cache
+        ))
         
-        Keep all other JSON structure and values exactly the same.
-        Return only the JSON, no explanations."""
-        
-        # Prepare the JSON for translation
-        user_message = f"Translate this JSON content. Original JSON:\n{json.dumps(parsed_nodes, indent=2)}"
-        
-        # Make the API call with new syntax
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.3
+        if missing_texts:
+            # Split large pages into smaller requests that are translated in parallel
+            chunks = [
+                missing_texts[i:i + TRANSLATION_CHUNK_SIZE]
+                for i in range(0, len(missing_texts), TRANSLATION_CHUNK_SIZE)
+            ]
+            log.debug(
+                "Translating %d of %d texts to %s in %d requests",
+                len(missing_texts), len(texts), target_language, len(chunks)
+            )
+            results = await asyncio.gather(
+                *(translate_texts(client, semaphore, chunk, target_language) for chunk in chunks)
             )
             
-            # Print the raw response for debugging
-            print("\nOpenAI Response:")
-            print(response)
-            
-            # Extract and validate the response content
-            response_content = response.choices[0].message.content
-            if not response_content:
-                return None, "Empty response from OpenAI"
-                
-            # Try to parse the JSON response
-            try:
-                translated_json = json.loads(response_content)
-                return translated_json, None
-            except json.JSONDecodeError as e:
-                print(f"JSON Parse Error: {str(e)}")
-                print("Raw response content:")
-                print(response_content)
-                return None, f"Failed to parse OpenAI response as JSON: {str(e)}"
-                
-        except Exception as e:
-            print(f"OpenAI API Error: {str(e)}")
-            return None, f"OpenAI API Error: {str(e)}"
+            # Cache every chunk that succeeded so a retry only resends the failed ones
+            first_error = None
+            for chunk, (translated_texts, error) in zip(chunks, results):
+                if error:
+                    first_error = first_error or error
+                    continue
+                for text, translated_text in zip(chunk, translated_texts):
+                    text_cache[(text, target_language)] = translated_text
+            if first_error:
+                return None, first_error
+        
+        else:
+            log.debug("Using cached translations for %s", target_language)
+        
+        translated_texts = [text_cache[(text, target_language)] for text in texts]
+        return translated_texts, None
             
     except Exception as e:
-        print(f"Unexpected Error: {str(e)}")
+        log.error("Unexpected Error: %s", e)
         return None, f"Translation error: {str(e)}"
 
-def update_page_content(page_id, locale_id, api_key, translated_content):
+async def update_page_content(http, page_id, locale_id, api_key, translated_content):
     """Update page content with translated text"""
     url = f"https://api.webflow.com/v2/pages/{page_id}/dom?localeId={locale_id}"
     headers = {
-        "accept": "application/json",
-        "authorization": f"Bearer {api_key}",
+        **auth_headers(api_key),
         "content-type": "application/json"
     }
     
-    # Restructure the translated content to match API requirements
     request_body = {
-        "nodes": []
+        "nodes": translated_content
     }
     
-    # Convert translated content into the correct format
-    for node in translated_content:
-        node_data = {
-            "nodeId": node.get('id') or node.get('nodeId'),  # Try both possible keys
-            "propertyOverrides": []
-        }
-        
-        if "propertyOverrides" in node:
-            node_data["propertyOverrides"] = []
-            for override in node["propertyOverrides"]:
-                node_data["propertyOverrides"].append({
-                    "propertyId": override["propertyId"],
-                    "text": override["text"] if isinstance(override["text"], str) else override["text"].get('text', '')
-                })
-        
-        request_body["nodes"].append(node_data)
-    
-    print("\n" + "="*50)
-    print("UPDATE PAGE CONTENT REQUEST")
-    print("="*50)
-    print(f"URL: {url}")
-    print("\nHeaders:")
-    for key, value in headers.items():
-        if key.lower() == 'authorization':
-            print(f"{key}: Bearer ****{value[-4:]}")
-        else:
-            print(f"{key}: {value}")
-    
-    print("\nPayload:")
-    print(json.dumps(request_body, indent=2))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            "UPDATE PAGE CONTENT REQUEST\nURL: %s\nHeaders: %s\nPayload:\n%s",
+            url, mask_headers(headers), orjson.dumps(request_body, option=orjson.OPT_INDENT_2).decode()
+        )
     
     try:
-        response = requests.post(url, headers=headers, json=request_body)
-        
-        print("\n" + "="*50)
-        print("API RESPONSE")
-        print("="*50)
-        print(f"Status Code: {response.status_code}")
-        try:
-            print(json.dumps(response.json(), indent=2))
-        except:
-            print(response.text)
-            
-        response.raise_for_status()
+        async with http.post(url, headers=headers, data=orjson.dumps(request_body)) as response:
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("API RESPONSE\nStatus Code: %s\n%s", response.status, await response.text())
+            response.raise_for_status()
         return True, None
     except Exception as e:
         error_message = str(e)
-        print(f"\nERROR: {error_message}")
+        log.error("Error updating page content: %s", error_message)
         return False, error_message
 
+async def translate_and_update_pages(page_id, parsed_content, targets, openai_key, api_key, on_progress=None):
+    """Translate content to every target locale concurrently and upload each result
+    
+    Returns one (translated_content, translate_error, update_error) tuple per target,
+    or the exception it raised, in the same order as `targets`. `on_progress` is called
+    with the number of finished targets, at most every PROGRESS_UPDATE_INTERVAL seconds.
+    """
+    # Imported here so reruns that never translate don't pay for loading them
+    import aiohttp
+    import openai
+    
+    # tenacity in translate_texts is the only retry layer, so the SDK's own
+    # backoff never sleeps while holding the OpenAI semaphore
+    client = openai.AsyncOpenAI(api_key=openai_key, max_retries=0)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSLATIONS)
+    openai_semaphore = asyncio.Semaphore(MAX_CONCURRENT_OPENAI_REQUESTS)
+    
+    async with aiohttp.ClientSession() as http:
+        async def translate_and_update(locale):
+            async with semaphore:
+                translated_texts, error = await translate_content_with_openai(
+                    client, openai_semaphore, parsed_content['texts'], locale['tag']
+                )
+                if error:
+                    return None, error, None
+                
+                translated_content = build_nodes(parsed_content['ids'], translated_texts)
+                
+                log.debug("Updating page content for %s (locale ID: %s)", locale['tag'], locale['id'])
+                success, error = await update_page_content(
+                    http,
+                    page_id=page_id,
+                    locale_id=locale['id'],
+                    api_key=api_key,
+                    translated_content=translated_content
+                )
+                return translated_content, None, None if success else error
+        
+        async def indexed(index, locale):
+            try:
+                return index, await translate_and_update(locale)
+            except Exception as e:
+                return index, e
+        
+        results = [None] * len(targets)
+        last_progress = 0.0
+        pending = [indexed(index, locale) for index, locale in enumerate(targets)]
+        for completed, finished in enumerate(asyncio.as_completed(pending), start=1):
+            index, result = await finished
+            results[index] = result
+            
+            # Each progress update is a frontend message, so batch them
+            now = time.monotonic()
+            if on_progress and (completed == len(targets) or now - last_progress >= PROGRESS_UPDATE_INTERVAL):
+                on_progress(completed)
+                last_progress = now
+        
+        return results
+
 def main():
     st.title("Webflow Page Content Manager")
     
-    # Print current session state
-    print("\nCurrent Session State:")
-    print(f"Has site_id: {bool(st.session_state.site_id)}")
-    print(f"Has api_key: {bool(st.session_state.api_key)}")
-    print(f"Number of pages: {len(st.session_state.pages)}")
-    print(f"Number of locales: {len(st.session_state.locales)}")
-    print(f"Has OpenAI key: {bool(st.session_state.openai_key)}")
-    print(f"Has current content: {bool(st.session_state.current_content)}")
+    # Log current session state
+    log.debug(
+        "Current Session State: site_id=%s api_key=%s pages=%d locales=%d openai_key=%s current_content=%s",
+        bool(st.session_state.site_id),
+        bool(st.session_state.api_key),
+        len(st.session_state.pages),
+        len(st.session_state.locales),
+        bool(st.session_state.openai_key),
+        bool(st.session_state.current_content)
+    )
     
     # Step 1: Get API Token and Site ID
     with st.form("credentials_form"):
@@ -394,58 +624,85 @@ def main():
         submit_button = st.form_submit_button("Validate & Fetch Site Data")
     
     if submit_button:
-        # First validate the API token
-        if validate_api_token(api_key):
+        # Step 2: Get Pages and Locales
+        with st.spinner("Fetching site data..."):
+            # Fetch locales and pages in parallel
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                locales_future = executor.submit(get_site_locales, site_id, api_key)
+                pages_future = executor.submit(get_pages, site_id, api_key)
+                locales, locales_error_code, locales_error = locales_future.result()
+                pages, pages_error_code, pages_error = pages_future.result()
+        
+        # The site request doubles as API token validation; the pages request
+        # additionally needs the pages:read scope. Report only the first failure.
+        if locales is None:
+            show_api_error(locales_error_code, locales_error)
+        elif pages is None:
+            show_api_error(pages_error_code, pages_error)
+        else:
             st.success("API token validated successfully!")
             st.session_state.site_id = site_id
             st.session_state.api_key = api_key
             
-            # Step 2: Get Pages and Locales
-            with st.spinner("Fetching site data..."):
-                # Get and display locales
-                locales = get_site_locales(site_id, api_key)
-                if locales:
-                    st.session_state.locales = locales
-                    st.subheader("Available Locales")
-                    locale_data = {
-                        "Type": [locale.get('type', 'Unknown') for locale in locales],
-                        "Display Name": [locale.get('displayName', 'Unnamed') for locale in locales],
-                        "Locale ID": [locale.get('id', 'No ID') for locale in locales],
-                        "Tag": [locale.get('tag', 'No tag') for locale in locales]
-                    }
-                    st.table(locale_data)
-                
-                # Get and display pages
-                pages = get_pages(site_id, api_key)
-                if pages:
-                    st.session_state.pages = pages
-                    st.subheader("Available Pages")
-                    page_data = {
-                        "Title": [page.get('title', 'Untitled') for page in pages],
-                        "Page ID": [page['id'] for page in pages],
-                        "Slug": [page.get('slug', 'No slug') for page in pages]
-                    }
-                    st.table(page_data)
+            # Display locales
+            if locales:
+                st.session_state.locales = locales
+                st.subheader("Available Locales")
+                locale_data = {
+                    "Type": [locale.get('type', 'Unknown') for locale in locales],
+                    "Display Name": [locale.get('displayName', 'Unnamed') for locale in locales],
+                    "Locale ID": [locale.get('id', 'No ID') for locale in locales],
+                    "Tag": [locale.get('tag', 'No tag') for locale in locales]
+                }
+                st.table(locale_data)
+            
+            # Display pages
+            if pages:
+                st.session_state.pages = pages
+                st.subheader("Available Pages")
+                page_data = {
+                    "Title": [page.get('title', 'Untitled') for page in pages],
+                    "Page ID": [page['id'] for page in pages],
+                    "Slug": [page.get('slug', 'No slug') for page in pages]
+                }
+                st.table(page_data)
     
     # Page selection and content viewing
     if st.session_state.pages:
         st.subheader("View Page Content")
-        selected_page = st.selectbox(
+        # Select by page ID so titles are never parsed back out of the label
+        page_labels = {
+            page['id']: f"{page.get('title', 'Untitled')} ({page['id']})"
+            for page in st.session_state.pages
+        }
+        page_id = st.selectbox(
             "Select a page",
-            options=[f"{page.get('title', 'Untitled')} ({page['id']})" for page in st.session_state.pages],
+            options=list(page_labels.keys()),
+            format_func=page_labels.get,
             key="page_selector"
         )
         
-        if selected_page:
-            page_id = selected_page.split('(')[-1].strip(')')
+        if page_id:
+            # View content button; refresh bypasses the cached copy of the page
+            view_clicked = st.button("View Content", key="view_content_button")
+            refresh_clicked = st.button(
+                "Refresh Content",
+                key="refresh_content_button",
+                help="Fetch the latest content from Webflow instead of the cached copy"
+            )
+            if refresh_clicked:
+                get_page_content.clear(page_id, st.session_state.api_key)
             
-            # View content button
-            if st.button("View Content", key="view_content_button"):
+            if view_clicked or refresh_clicked:
                 with st.spinner("Fetching page content..."):
                     content = get_page_content(page_id, st.session_state.api_key)
                     if content:
                         st.session_state.current_content = content
-                        st.session_state.parsed_nodes = parse_page_content(content)
+                        st.session_state.parsed_content = parse_page_content(content)
+                        st.session_state.translations = {}
+                    else:
+                        # Don't keep the failed lookup in the cache
+                        get_page_content.clear(page_id, st.session_state.api_key)
             
             # Display content if available
             if st.session_state.current_content:
@@ -453,7 +710,10 @@ def main():
                 st.json(st.session_state.current_content)
                 
                 st.subheader("Parsed Nodes with Property Overrides")
-                st.json(st.session_state.parsed_nodes)
+                st.json(build_nodes(
+                    st.session_state.parsed_content['ids'],
+                    st.session_state.parsed_content['texts']
+                ))
                 
                 # Translation section
                 if st.session_state.openai_key and st.session_state.locales:
@@ -480,101 +740,70 @@ def main():
                             st.warning("Please select at least one language")
                             return
                             
-                        print(f"\nTranslating to {len(target_languages)} languages")
+                        log.debug("Translating to %d languages", len(target_languages))
                         
                         # Create a progress bar
                         progress_bar = st.progress(0)
                         translation_status = st.empty()
+                        translation_status.text(f"Translating to {len(target_languages)} languages...")
                         
-                        # Process each language
-                        for index, target_language in enumerate(target_languages):
-                            translation_status.text(f"Processing {target_language} ({index + 1}/{len(target_languages)})")
-                            print(f"\nProcessing language: {target_language}")
+                        # Translate and update every language concurrently
+                        with st.spinner("Translating..."):
+                            results = asyncio.run(translate_and_update_pages(
+                                page_id=page_id,
+                                parsed_content=st.session_state.parsed_content,
+                                targets=[locale_options[language] for language in target_languages],
+                                openai_key=st.session_state.openai_key,
+                                api_key=st.session_state.api_key,
+                                on_progress=lambda done: progress_bar.progress(done / len(target_languages))
+                            ))
+                        
+                        for target_language, result in zip(target_languages, results):
+                            if isinstance(result, Exception):
+                                st.error(f"Error translating to {target_language}: {str(result)}")
+                                continue
+                            
+                            translated_content, translate_error, update_error = result
+                            if translate_error:
+                                st.error(f"Error translating to {target_language}: {translate_error}")
+                                continue
                             
-                            with st.spinner(f"Translating to {target_language}..."):
-                                # Use the language tag for translation
-                                translated_content, error = translate_content_with_openai(
-                                    st.session_state.parsed_nodes,
-                                    locale_options[target_language]['tag'],
-                                    st.session_state.openai_key
-                                )
-                                
-                                if error:
-                                    st.error(f"Error translating to {target_language}: {error}")
-                                    continue
-                                
-                                # Get the locale ID for the API call
-                                locale_id = locale_options[target_language]['id']
-                                print(f"\nUsing locale ID: {locale_id}")
-                                print(f"Language tag: {locale_options[target_language]['tag']}")
-                                
-                                # Create an expander for each language's details
-                                with st.expander(f"Translation Details - {target_language}", expanded=False):
-                                    st.subheader("Translated Content")
-                                    st.json(translated_content)
-                                
-                                # Update the page content with translated text
-                                print(f"\nUpdating page content for {target_language}...")
-                                success, error = update_page_content(
-                                    page_id=page_id,
-                                    locale_id=locale_id,
-                                    api_key=st.session_state.api_key,
-                                    translated_content=translated_content
-                                )
-                                
-                                if success:
-                                    st.success(f"Successfully updated content for {target_language}")
-                                else:
-                                    st.error(f"Failed to update content for {target_language}: {error}")
-                                
-                                # Update progress
-                                progress = (index + 1) / len(target_languages)
-                                progress_bar.progress(progress)
-                                
-                                # Add a small delay between requests to avoid rate limits
-                                time.sleep(1)
+                            # Keep the translation for the download below
+                            st.session_state.translations[locale_options[target_language]['tag']] = translated_content
+                            
+                            # Create an expander for each language's details
+                            with st.expander(f"Translation Details - {target_language}", expanded=False):
+                                st.subheader("Translated Content")
+                                st.json(translated_content)
+                            
+                            if update_error:
+                                st.error(f"Failed to update content for {target_language}: {update_error}")
+                            else:
+                                st.success(f"Successfully updated content for {target_language}")
                         
                         translation_status.text("All translations completed!")
                         
-                        # Create a zip file with all translations
-                        if st.button("Download All Translations", key="download_all"):
-                            with st.spinner("Preparing download..."):
-                                # Create a temporary directory for the files
-                                with tempfile.TemporaryDirectory() as temp_dir:
-                                    # Save each translation to a file
-                                    for target_language in target_languages:
-                                        translated_content, _ = translate_content_with_openai(
-                                            st.session_state.parsed_nodes,
-                                            locale_options[target_language]['tag'],
-                                            st.session_state.openai_key
-                                        )
-                                        
-                                        if translated_content:
-                                            file_path = os.path.join(
-                                                temp_dir, 
-                                                f"translation_{locale_options[target_language]['tag']}.json"
-                                            )
-                                            with open(file_path, 'w') as f:
-                                                json.dump(translated_content, f, indent=2)
-                                    
-                                    # Create zip file
-                                    zip_path = os.path.join(temp_dir, "translations.zip")
-                                    with zipfile.ZipFile(zip_path, 'w') as zipf:
-                                        for file in os.listdir(temp_dir):
-                                            if file.endswith('.json'):
-                                                zipf.write(
-                                                    os.path.join(temp_dir, file),
-                                                    file
-                                                )
-                                    
-                                    # Read the zip file for download
-                                    with open(zip_path, 'rb') as f:
-                                        st.download_button(
-                                            label="Download Translations ZIP",
-                                            data=f.read(),
-                                            file_name="translations.zip",
-                                            mime="application/zip"
-                                        )
+                    # Create a zip file with all translations made for this page
+                    if st.session_state.translations and st.button("Download All Translations", key="download_all"):
+                        with st.spinner("Preparing download..."):
+                            import io
+                            import zipfile
+                            
+                            # Build the zip file in memory
+                            buffer = io.BytesIO()
+                            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                                for tag, translated_content in st.session_state.translations.items():
+                                    zipf.writestr(
+                                        f"translation_{tag}.json",
+                                        orjson.dumps(translated_content, option=orjson.OPT_INDENT_2)
+                                    )
+                            
+                            st.download_button(
+                                label="Download Translations ZIP",
+                                data=buffer.getvalue(),
+                                file_name="translations.zip",
+                                mime="application/zip"
+                            )
                 else:
                     if not st.session_state.openai_key:
                         st.warning("Please add your OpenAI API key in the sidebar to enable translations")
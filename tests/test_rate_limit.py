@@ -0,0 +1,97 @@
+import asyncio
+import importlib.util
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import openai
+import pytest
+import streamlit as st
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Load app.py in Streamlit bare mode"""
+    spec = importlib.util.spec_from_file_location("langverse_app", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def reset_pause(app):
+    st.session_state.openai_resume_at = 0.0
+
+
+class FakeRawResponse:
+    def __init__(self, texts, headers):
+        self.headers = headers
+        self._content = json.dumps({"translations": [text.upper() for text in texts]})
+
+    def parse(self):
+        message = SimpleNamespace(content=self._content, refusal=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")])
+
+
+class FakeClient:
+    """Stands in for AsyncOpenAI, recording when each request is sent"""
+
+    def __init__(self, headers, rate_limited_calls=0):
+        self.headers = headers
+        self.rate_limited_calls = rate_limited_calls
+        self.sent_at = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(
+            with_raw_response=SimpleNamespace(create=self.create)
+        ))
+
+    async def create(self, **kwargs):
+        self.sent_at.append(time.monotonic())
+        await asyncio.sleep(0.01)
+        if len(self.sent_at) <= self.rate_limited_calls:
+            response = SimpleNamespace(status_code=429, headers=self.headers, request=None)
+            raise openai.RateLimitError("Rate limit reached", response=response, body=None)
+        texts = json.loads(kwargs["messages"][1]["content"])
+        return FakeRawResponse(texts, self.headers)
+
+
+def test_queued_chunks_wait_for_pause_set_while_queued(app):
+    # Every response reports an exhausted budget, so chunks queued behind the
+    # first batch must not be sent until the announced reset
+    client = FakeClient({
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "300ms"
+    })
+    texts = [f"text {i}" for i in range(10 * app.TRANSLATION_CHUNK_SIZE)]
+
+    async def run():
+        semaphore = asyncio.Semaphore(8)
+        return await app.translate_content_with_openai(client, semaphore, texts, "fr")
+
+    translated_texts, error = asyncio.run(run())
+
+    assert error is None
+    assert translated_texts == [text.upper() for text in texts]
+    sent_at = sorted(client.sent_at)
+    assert len(sent_at) == 10
+    assert sent_at[8] - sent_at[0] >= 0.3
+    assert sent_at[9] - sent_at[0] >= 0.3
+
+
+def test_rate_limit_error_pauses_other_requests(app):
+    client = FakeClient({"x-ratelimit-reset-requests": "300ms"}, rate_limited_calls=1)
+
+    async def run():
+        semaphore = asyncio.Semaphore(1)
+        return await asyncio.gather(
+            app.translate_texts(client, semaphore, ["a"], "fr"),
+            app.translate_texts(client, semaphore, ["b"], "fr")
+        )
+
+    results = asyncio.run(run())
+
+    assert results == [(["A"], None), (["B"], None)]
+    # The request after the 429 waits for the reset instead of firing at once
+    assert client.sent_at[1] - client.sent_at[0] >= 0.3